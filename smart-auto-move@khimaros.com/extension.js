@@ -3,6 +3,7 @@
 // imports
 const Main = imports.ui.main;
 const Mainloop = imports.mainloop;
+const GLib = imports.gi.GLib;
 const St = imports.gi.St;
 const Meta = imports.gi.Meta;
 const ExtensionUtils = imports.misc.extensionUtils;
@@ -22,6 +23,7 @@ let savedWindows;
 
 // mutable runtime state
 let activeWindows;
+let savingSavedWindows;
 let settings;
 
 // signal descriptors
@@ -45,6 +47,7 @@ function init() {
 
 function enable() {
 	activeWindows = new Map();
+	savingSavedWindows = false;
 
 	initializeSettings();
 
@@ -65,6 +68,7 @@ function disable() {
 	cleanupSettings();
 
 	activeWindows = null;
+	savingSavedWindows = null;
 }
 
 //// SETTINGS
@@ -112,23 +116,17 @@ function restoreSettings() {
 }
 
 function saveSettings() {
-	settings.set_boolean(Common.SETTINGS_KEY_DEBUG_LOGGING, debugLogging);
-	settings.set_int(Common.SETTINGS_KEY_STARTUP_DELAY, startupDelayMs);
-	settings.set_int(Common.SETTINGS_KEY_SYNC_FREQUENCY, syncFrequencyMs);
-	settings.set_int(Common.SETTINGS_KEY_SAVE_FREQUENCY, saveFrequencyMs);
-	settings.set_double(Common.SETTINGS_KEY_MATCH_THRESHOLD, matchThreshold);
-	settings.set_enum(Common.SETTINGS_KEY_SYNC_MODE, syncMode);
-	settings.set_boolean(Common.SETTINGS_KEY_FREEZE_SAVES, freezeSaves);
-
-	let newOverrides = JSON.stringify(overrides);
-	settings.set_string(Common.SETTINGS_KEY_OVERRIDES, newOverrides);
+	// NOTE: scalar settings and overrides are only ever read from gsettings
+	// (see the handleChanged*() functions), so there is nothing to write back.
 
 	let oldSavedWindows = settings.get_string(Common.SETTINGS_KEY_SAVED_WINDOWS);
 	let newSavedWindows = JSON.stringify(savedWindows);
 	if (oldSavedWindows === newSavedWindows) return;
 	debug('saveSettings()');
 	dumpSavedWindows();
+	savingSavedWindows = true;
 	settings.set_string(Common.SETTINGS_KEY_SAVED_WINDOWS, newSavedWindows);
+	savingSavedWindows = false;
 }
 
 //// WINDOW UTILITIES
@@ -171,18 +169,29 @@ function windowHash(win) {
 }
 
 function windowDataEqual(sw1, sw2) {
-	return JSON.stringify(sw1) === JSON.stringify(sw2);
+	let keys = Object.keys(sw1);
+	if (keys.length !== Object.keys(sw2).length) return false;
+	return keys.every((key) => sw1[key] === sw2[key]);
+}
+
+// NOTE: uses the monotonic clock so wall clock changes (eg. NTP, suspend)
+// do not affect window age.
+function monotonicTimeMs() {
+	return GLib.get_monotonic_time() / 1000;
 }
 
 function windowNewerThan(win, age) {
 	let wh = windowHash(win);
+	let now = monotonicTimeMs();
 
 	// TODO: consider using a state machine here: CREATED, MOVED, SAVED, etc.
-	if (activeWindows.get(wh) === undefined) {
-		activeWindows.set(wh, Date.now());
+	let created = activeWindows.get(wh);
+	if (created === undefined) {
+		created = now;
+		activeWindows.set(wh, created);
 	}
 
-	return (Date.now() - activeWindows.get(wh) < age);
+	return (now - created < age);
 }
 
 //// WINDOW SAVE / RESTORE
@@ -202,7 +211,7 @@ function pushSavedWindow(win) {
 function updateSavedWindow(win) {
 	let wsh = windowSectionHash(win);
 	//debug('updateSavedWindow() - start: ' + wsh + ', ' + win.get_title());
-	let [swi, _] = Common.findSavedWindow(savedWindows, wsh, { hash: windowHash(win) }, 1.0);
+	let swi = Common.findExactSavedWindow(savedWindows, wsh, { hash: windowHash(win) });
 	if (swi === undefined)
 		return false;
 	let sw = windowData(win);
@@ -225,10 +234,7 @@ function ensureSavedWindow(win) {
 	}
 }
 
-function findOverrideAction(win, threshold) {
-	let wsh = windowSectionHash(win);
-	let sw = windowData(win);
-
+function findOverrideAction(wsh, sw, threshold) {
 	let action = syncMode;
 
 	let override = Common.findOverride(overrides, wsh, sw, threshold);
@@ -261,7 +267,7 @@ function restoreWindow(win) {
 
 	let sw;
 
-	let [swi, _] = Common.findSavedWindow(savedWindows, wsh, { hash: windowHash(win), occupied: true }, 1.0);
+	let swi = Common.findExactSavedWindow(savedWindows, wsh, { hash: windowHash(win), occupied: true });
 
 	if (swi !== undefined) return false;
 
@@ -271,33 +277,30 @@ function restoreWindow(win) {
 
 	if (swi === undefined) return false;
 
-	if (windowDataEqual(sw, windowData(win))) return true;
+	// snapshot the current window state once rather than querying it per use.
+	let cw = windowData(win);
+
+	if (windowDataEqual(sw, cw)) return true;
 
-	let action = findOverrideAction(win, 1.0);
+	let action = findOverrideAction(wsh, cw, 1.0);
 	if (action !== Common.SYNC_MODE_RESTORE) return true;
 
 	//debug('restoreWindow() - found: ' + JSON.stringify(sw));
 
-	let pWinRepr = windowRepr(win);
-
 	let nsw = moveWindow(win, sw);
 
 	if (!(sw.x === nsw.x && sw.y === nsw.y)) return true;
 
-	debug('restoreWindow() - moved: ' + pWinRepr + ' => ' + JSON.stringify(nsw));
+	if (debugLogging)
+		debug('restoreWindow() - moved: ' + JSON.stringify(cw) + ' => ' + JSON.stringify(nsw));
 
 	savedWindows[wsh][swi] = nsw;
 
 	return true;
 }
 
-function cleanupWindows() {
-	let found = new Map();
-
-	global.get_window_actors().forEach(function (actor) {
-		let win = actor.get_meta_window();
-		found.set(windowHash(win), true);
-	});
+function cleanupWindows(actors) {
+	let found = new Set(actors.map((actor) => windowHash(actor.get_meta_window())));
 
 	Object.keys(savedWindows).forEach(function (wsh) {
 		let sws = savedWindows[wsh];
@@ -311,7 +314,10 @@ function cleanupWindows() {
 }
 
 function shouldSkipWindow(win) {
-	debug('shouldSkipWindow() ' + win.get_title() + ' ' + win.is_skip_taskbar() + ' ' + win.get_window_type());
+	// NOTE: called for every window on every sync tick; avoid building the
+	// message (and its extra window queries) unless debug logging is enabled.
+	if (debugLogging)
+		debug('shouldSkipWindow() ' + win.get_title() + ' ' + win.is_skip_taskbar() + ' ' + win.get_window_type());
 
 	if (win.is_skip_taskbar()) return true;
 
@@ -321,8 +327,9 @@ function shouldSkipWindow(win) {
 }
 
 function syncWindows() {
-	cleanupWindows();
-	global.get_window_actors().forEach(function (actor) {
+	let actors = global.get_window_actors();
+	cleanupWindows(actors);
+	actors.forEach(function (actor) {
 		let win = actor.get_meta_window();
 
 		if (shouldSkipWindow(win)) return;
@@ -383,12 +390,16 @@ function handleChangedFreezeSaves() {
 
 function handleChangedOverrides() {
 	overrides = JSON.parse(settings.get_string(Common.SETTINGS_KEY_OVERRIDES));
-	debug('handleChangedOverrides(): ' + JSON.stringify(overrides));
+	if (debugLogging)
+		debug('handleChangedOverrides(): ' + JSON.stringify(overrides));
 }
 
 function handleChangedSavedWindows() {
+	// ignore the change signal raised by our own write in saveSettings().
+	if (savingSavedWindows) return;
 	savedWindows = JSON.parse(settings.get_string(Common.SETTINGS_KEY_SAVED_WINDOWS));
-	debug('handleChangedSavedWindows(): ' + JSON.stringify(savedWindows));
+	if (debugLogging)
+		debug('handleChangedSavedWindows(): ' + JSON.stringify(savedWindows));
 }
 
 //// SIGNAL HELPERS
@@ -458,6 +469,8 @@ function debug(message) {
 }
 
 function dumpSavedWindows() {
+	if (!debugLogging) return;
+
 	Object.keys(savedWindows).forEach(function (wsh) {
 		let sws = savedWindows[wsh];
 		debug('dumpSavedwindows(): ' + wsh + ' ' + JSON.stringify(sws));
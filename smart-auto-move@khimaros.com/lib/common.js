@@ -26,24 +26,30 @@ var DEFAULT_SYNC_MODE = SYNC_MODE_RESTORE;
 var DEFAULT_FREEZE_SAVES = false;
 
 function levensteinDistance(a, b) {
-	var m = [], i, j, min = Math.min;
+	var prev, curr, tmp, i, j, min = Math.min;
 
 	if (!(a && b)) return (b || a).length;
 
-	for (i = 0; i <= b.length; m[i] = [i++]);
-	for (j = 0; j <= a.length; m[0][j] = j++);
+	// only the previous row of the distance matrix is needed, so keep two
+	// rows rather than allocating the full (b.length + 1) x (a.length + 1).
+	prev = new Array(a.length + 1);
+	curr = new Array(a.length + 1);
+
+	for (j = 0; j <= a.length; prev[j] = j++);
 
 	for (i = 1; i <= b.length; i++) {
+		curr[0] = i;
 		for (j = 1; j <= a.length; j++) {
-			m[i][j] = b.charAt(i - 1) == a.charAt(j - 1)
-				? m[i - 1][j - 1]
-				: m[i][j] = min(
-					m[i - 1][j - 1] + 1,
-					min(m[i][j - 1] + 1, m[i - 1][j] + 1))
+			curr[j] = b.charAt(i - 1) == a.charAt(j - 1)
+				? prev[j - 1]
+				: min(
+					prev[j - 1] + 1,
+					min(curr[j - 1] + 1, prev[j] + 1));
 		}
+		tmp = prev; prev = curr; curr = tmp;
 	}
 
-	return m[b.length][a.length];
+	return prev[a.length];
 }
 
 function scoreWindow(sw, query) {
@@ -51,18 +57,19 @@ function scoreWindow(sw, query) {
 	if (query.occupied !== undefined && sw.occupied != query.occupied) return 0;
 	let match_parts = 0;
 	let query_parts = 0;
-	Object.keys(query).forEach(function (key) {
+	for (let key of Object.keys(query)) {
 		let value = query[key];
+		let sw_value = sw[key];
 		if (key === 'title') {
-			let dist = levensteinDistance(value, sw[key]);
+			let dist = levensteinDistance(value, sw_value);
 			let title_score = (value.length - dist) / value.length;
 			if (title_score < 0) title_score = -0.3;
 			match_parts += title_score;
-		} else if (sw[key] === value) {
+		} else if (sw_value === value) {
 			match_parts += 1;
 		}
 		query_parts += 1;
-	});
+	}
 	let score = match_parts / query_parts;
 	if (score < 0) score = 0;
 	return score;
@@ -74,18 +81,18 @@ function findSavedWindow(saved_windows, wsh, query, threshold) {
 		return [undefined, undefined];
 	}
 
-	let scores = new Map();
+	// single pass for the best score. ties go to the earliest saved window.
+	let best_swi = undefined;
+	let best_score = undefined;
 	saved_windows[wsh].forEach(function (sw, swi) {
 		let score = scoreWindow(sw, query);
-		scores.set(swi, score);
+		if (best_score === undefined || score > best_score) {
+			best_swi = swi;
+			best_score = score;
+		}
 	});
 
-	let sorted_scores = new Map([...scores.entries()].sort((a, b) => b[1] - a[1]));
-
-	//debug('findSavedWindow() - sorted_scores: ' + JSON.stringify(Array.from(sorted_scores.entries())));
-
-	let best_swi = sorted_scores.keys().next().value;
-	let best_score = sorted_scores.get(best_swi);
+	//debug('findSavedWindow() - best: ' + best_swi + ' ' + best_score);
 
 	let found = undefined;
 	if (best_score >= threshold)
@@ -96,31 +103,39 @@ function findSavedWindow(saved_windows, wsh, query, threshold) {
 	return [found, best_score];
 }
 
+// exact match lookup for non-fuzzy queries (eg. by window hash). equivalent to
+// findSavedWindow() with a threshold of 1.0, without scoring every window.
+function findExactSavedWindow(saved_windows, wsh, query) {
+	if (!saved_windows.hasOwnProperty(wsh)) return undefined;
+
+	let keys = Object.keys(query);
+	let found = saved_windows[wsh].findIndex(function (sw) {
+		return keys.every((key) => sw[key] === query[key]);
+	});
+
+	if (found < 0) return undefined;
+
+	return found;
+}
+
 function findOverride(overrides, wsh, sw, threshold) {
 	let override = {};
-	let matched = false;
 
 	if (!overrides.hasOwnProperty(wsh)) {
 		//debug('findOverrideAction(): no overrides for section ' + wsh);
 		return override;
 	}
-	overrides[wsh].forEach(function (o, oi) {
-		if (matched) return;
-		if (!o.hasOwnProperty('query')) {
-			override.action = o.action;
-			override.threshold = o.threshold;
-			matched = true;
-			return;
-		}
-		let score = scoreWindow(sw, o.query);
-		if (score >= threshold) {
-			override.action = o.action;
-			override.threshold = o.threshold;
-			matched = true;
-			return;
-		}
+	// stop at the first matching override rather than visiting the rest.
+	let matched = overrides[wsh].find(function (o) {
+		if (!o.hasOwnProperty('query')) return true;
+		return scoreWindow(sw, o.query) >= threshold;
 	});
 
+	if (matched !== undefined) {
+		override.action = matched.action;
+		override.threshold = matched.threshold;
+	}
+
 	//debug('findOverrideAction(): ' + wsh + ' ' + JSON.stringify(sw) + ' ' + action);
 	return override;
 }
@@ -75,6 +75,38 @@ assertFoundWindow(
     undefined,
 );
 
+function assertFoundExactWindow(saved_windows, wsh, query, want_found) {
+    let found = Common.findExactSavedWindow(saved_windows, wsh, query);
+    console.assert(want_found === found, {want_found: want_found, found: found, saved_windows: saved_windows, query: query});
+}
+
+assertFoundExactWindow(
+    {'gnome-terminal': [
+        {hash: 1001, title: 'user@host: ~', occupied: false},
+        {hash: 1002, title: 'user@host: ~/src', occupied: true},
+        {hash: 1003, title: 'user@host: ~/scratch'}
+    ]},
+    'gnome-terminal', {hash: 1002},
+    1,
+);
+
+assertFoundExactWindow(
+    {'gnome-terminal': [
+        {hash: 1001, title: 'user@host: ~', occupied: false},
+        {hash: 1002, title: 'user@host: ~/src', occupied: true},
+    ]},
+    'gnome-terminal', {hash: 1001, occupied: true},
+    undefined,
+);
+
+assertFoundExactWindow(
+    {'gnome-terminal': [
+        {hash: 1001, title: 'user@host: ~', occupied: false},
+    ]},
+    'firefox', {hash: 1001},
+    undefined,
+);
+
 function assertFoundOverride(overrides, wsh, sw, threshold, want_found) {
     let found = Common.findOverride(overrides, wsh, sw, threshold);
     console.assert(JSON.stringify(want_found) === JSON.stringify(found), {want_found: want_found, found: found, overrides: overrides, sw: sw, threshold: threshold});